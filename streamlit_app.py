@@ -1,23 +1,207 @@
 import streamlit as st
 import asyncio
+import collections
 import threading
 import queue
 import time
 import json
+import functools
+import weakref
 import base64
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait, TimeoutError as FutureTimeoutError
 from PIL import Image
 from io import BytesIO
-import requests
+import httpx
 from bs4 import BeautifulSoup
+import soupsieve
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, parse_qs, parse_qsl, urlencode, urlunparse
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from openai import OpenAI
 import os
 from dataclasses import dataclass
 from typing import List, Dict, Any
 
+try:
+    # lexbor is a C HTML engine; much faster than BeautifulSoup's html.parser
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    # libxml2-backed BeautifulSoup tree builder, much faster than html.parser
+    BS4_PARSER = 'lxml'
+except ImportError:
+    BS4_PARSER = 'html.parser'
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    import brotli  # noqa: F401
+    # httpx only decodes br bodies when brotli is installed, so only ask for it then
+    ACCEPT_ENCODING = 'gzip, br, deflate'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Default headers for plain HTTP page fetches (connections are kept alive by the client)
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+# Shared Chromium configuration for browser-driven searches
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-file-system",
+    "--disable-web-security",
+    f"--user-agent={BROWSER_USER_AGENT}"
+]
+# HTML, XHR and scripts still load so JS-driven result pages render
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet", "websocket", "manifest"})
+# Analytics / ad hosts whose requests are aborted whatever their type
+TRACKER_URL_RE = re.compile(r"^https?://([^/]+\.)?(google-analytics|googletagmanager|doubleclick|hotjar|segment)\.com(:\d+)?([/?#]|$)")
+
+# Frames pushed by Chromium for the live browser view (CDP Page.startScreencast)
+SCREENCAST_OPTIONS = {"format": "jpeg", "quality": 60, "maxWidth": 960, "maxHeight": 540, "everyNthFrame": 2}
+# Fallback screenshots are shrunk to the same preview size before reaching the UI
+PREVIEW_SIZE = (960, 540)
+
+# Evaluated in the page; true when it shows a CAPTCHA / bot-detection notice
+CAPTCHA_CHECK_JS = "() => !!document.body && /captcha|unusual traffic|not a robot/i.test(document.body.innerText)"
+
+# Browser-driven search engines; 'extractor' names the bot method that parses the results page
+SEARCH_ENGINES = {
+    'google': {
+        'name': 'Google',
+        'url': 'https://www.google.com',
+        'input_selectors': [
+            "textarea[name='q']",
+            "input[name='q']",
+            "textarea[title='Search']",
+            "input[title='Search']",
+            "#APjFqb",
+            ".gLFyf"
+        ],
+        'cookie_consent': "button:has-text('Accept all'), button:has-text('I agree'), #L2AGLb",
+        'type_delay': 50,
+        'extractor': 'extract_google_results',
+        'captcha_check': True,
+        'fallback_engine': 'duckduckgo',
+    },
+    'duckduckgo': {
+        'name': 'DuckDuckGo',
+        'url': 'https://duckduckgo.com/',
+        'input_selectors': ["input[name='q']"],
+        'cookie_consent': None,
+        'type_delay': None,
+        'extractor': 'extract_duckduckgo_results',
+        'captcha_check': False,
+        # No engine left to try; use fallback_search_api / fallback_search_and_summarize
+        'fallback_engine': None,
+    },
+}
+
+# Server-rendered DuckDuckGo results, no JavaScript (or browser) required
+DUCKDUCKGO_HTML_URL = 'https://html.duckduckgo.com/html/'
+DUCKDUCKGO_HTML_RESULT_SELECTOR = 'div.result:not(.result--ad)'
+
+# Scraped pages are read up to this many (decompressed) bytes
+MAX_PAGE_BYTES = 64 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml')
+# Messages scrape_webpage_content returns in place of page text
+SCRAPE_FAILURE_PREFIXES = ('Invalid URL: ', 'Failed to fetch ', 'Skipped ', 'Could not scrape content from ')
+
+WHITESPACE_RE = re.compile(r'\s+')
+# Result links worth keeping
+HTTP_URL_RE = re.compile(r'^https?://')
+
+# Selectors and tags used when extracting results and page text
+GOOGLE_RESULT_SELECTOR = 'div.g, div.tF2Cxc, div.MjjYud, div[data-sokoban-container] div.g'
+GOOGLE_TITLE_SELECTOR = 'h3, .LC20lb, .DKV0Md'
+GOOGLE_SNIPPET_SELECTOR = '.VwiC3b, .s3v9rd, .IsZvec, .aCOpRe, .st'
+# DuckDuckGo layouts, tried in order; only one of them is present on a page
+DUCKDUCKGO_RESULT_SELECTORS = ('article[data-testid="result"]', '.nrn-react-div article', '.result')
+DUCKDUCKGO_TITLE_SELECTOR = 'h2 a, .result__title a, [data-testid="result-title-a"]'
+DUCKDUCKGO_SNIPPET_SELECTOR = '[data-testid="result-snippet"], .result__snippet, .result__body'
+CONTENT_SELECTORS = ('main', 'article', '.content', '#content', '.post', '.entry')
+STRIPPED_TAGS = ["script", "style", "nav", "footer", "header", "aside", "iframe", "noscript"]
+
+# Links to these domains (and their subdomains) are never search results
+SKIP_DOMAINS = frozenset({'google.com'})
+
+# Query parameters that don't change page content
+TRACKING_PARAM_PREFIXES = ('utm_', 'fbclid', 'gclid', 'mc_')
+
+# Query words that select a category of canned fallback results
+FALLBACK_TERMS = {
+    'ai': 'ai', 'artificial': 'ai', 'intelligence': 'ai',
+    '2024': 'trends', 'trends': 'trends', 'latest': 'trends',
+}
+FALLBACK_TERM_RE = re.compile(r'\b(' + '|'.join(FALLBACK_TERMS) + r')\b', re.IGNORECASE)
+# Canned results per category, in the order they are offered (shared, never mutated)
+FALLBACK_RESULTS = {
+    'ai': (
+        {
+            'title': 'Artificial Intelligence Trends - MIT Technology Review',
+            'url': 'https://www.technologyreview.com/topic/artificial-intelligence/',
+            'snippet': 'Latest developments in artificial intelligence research and applications.'
+        },
+        {
+            'title': 'AI News and Research - OpenAI',
+            'url': 'https://openai.com/blog',
+            'snippet': 'Research updates and insights from OpenAI on artificial intelligence.'
+        },
+    ),
+    'trends': (
+        {
+            'title': 'Tech Trends 2024 - Forbes',
+            'url': 'https://www.forbes.com/technology/',
+            'snippet': 'Latest technology trends and innovations for 2024.'
+        },
+    ),
+}
+
+# Scraped pages and summaries are reused for this long (seconds), up to this many entries each
+CACHE_TTL = 3600
+CACHE_SIZE = 512
+# Complete search results are reused for a shorter time so fresh results still arrive
+SEARCH_CACHE_TTL = 600
+SEARCH_CACHE_SIZE = 64
+
+# Cost-effective model used for summaries and AI-only answers
+OPENAI_MODEL = "gpt-4o-mini"
+# Token budget for each result's page content in the summary prompt
+SUMMARY_TOKENS_PER_RESULT = 1200
+# ...and for all page content together, filled in result order. Pages are
+# fetched at 2000 characters (~500 tokens), so this binds past ~6 results
+SUMMARY_TOKEN_BUDGET = 3000
+
+# Once half the pages are scraped, stragglers get this long before the summary starts
+STRAGGLER_GRACE_SECONDS = 2
+
+# Longest a search waits for the shared browser worker (queueing included)
+BROWSER_JOB_TIMEOUT = 90
+
+# Activity log entries buffered per bot between reruns
+LOG_WINDOW = 500
+# Log entries kept and shown in the activity panel
+LOG_DISPLAY_ENTRIES = 25
+
+# Upper bound on concurrent page fetches per search, and per host
+MAX_SCRAPE_WORKERS = 8
+MAX_SCRAPES_PER_HOST = 2
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="🤖 Autonomous Browser Search Bot",
@@ -80,6 +264,335 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def parse_html(html):
+    """Parse HTML with selectolax when available, otherwise BeautifulSoup"""
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(html)
+    return BeautifulSoup(html, BS4_PARSER)
+
+@functools.lru_cache(maxsize=64)
+def compiled_selector(selector):
+    """Compile a soupsieve selector once and reuse it for every node and query"""
+    return soupsieve.compile(selector)
+
+def css_select(node, selector, limit=None):
+    """Return the nodes matching a CSS selector (at most limit of them, if given)"""
+    if LexborHTMLParser is not None:
+        return node.css(selector)[:limit]
+    return compiled_selector(selector).select(node, limit=limit or 0)
+
+def css_first(node, selector):
+    """Return the first node matching a CSS selector, or None"""
+    if LexborHTMLParser is not None:
+        return node.css_first(selector)
+    return compiled_selector(selector).select_one(node)
+
+def node_text(node, separator=None):
+    """Return the stripped text content of a node
+
+    With a separator, every text fragment is stripped and joined with it.
+    """
+    if separator is not None:
+        if LexborHTMLParser is not None:
+            return node.text(separator=separator, strip=True)
+        return node.get_text(separator=separator, strip=True)
+    if LexborHTMLParser is not None:
+        return node.text().strip()
+    # A lone text node needs no descendant walk
+    if node.string is not None:
+        return node.string.strip()
+    return node.get_text().strip()
+
+def node_attr(node, name):
+    """Return an attribute value of a node, or an empty string"""
+    if LexborHTMLParser is not None:
+        return node.attributes.get(name) or ''
+    return node.get(name, '')
+
+def strip_tags(tree, tags):
+    """Remove the given tags (and their contents) from a parsed document"""
+    if LexborHTMLParser is not None:
+        tree.strip_tags(tags)
+    else:
+        for element in tree(tags):
+            element.decompose()
+
+def document_body(tree):
+    """Return the <body> node of a parsed document, or the document itself"""
+    if LexborHTMLParser is not None:
+        return tree.body or tree.root
+    return tree.find('body') or tree
+
+@functools.lru_cache(maxsize=None)
+def token_encoding():
+    """Return the tiktoken encoding for OPENAI_MODEL, or None when it is unavailable
+
+    A failed load is cached too, so an unreachable download isn't retried per summary.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(OPENAI_MODEL)
+    except Exception:
+        # BPE file couldn't be downloaded, or the model is unknown to this tiktoken
+        return None
+
+def pack_tokens(texts, max_tokens_each, max_tokens_total):
+    """Clip texts to a per-text token budget, in order, until a shared total runs out
+
+    Returns one clipped string per input text; texts past the total come back
+    empty. Without a tiktoken encoding a token is approximated as 4 characters.
+    """
+    packed = []
+    remaining = max_tokens_total
+    encoding = token_encoding()
+    for text in texts:
+        budget = min(max_tokens_each, remaining)
+        if budget <= 0:
+            # Budget spent; don't pay for encoding the remaining texts
+            packed.append('')
+            continue
+        if encoding is None:
+            clipped = text[:budget * 4]
+            used = (len(clipped) + 3) // 4
+        else:
+            tokens = encoding.encode(text)
+            if len(tokens) > budget:
+                tokens = tokens[:budget]
+                clipped = encoding.decode(tokens)
+            else:
+                clipped = text
+            used = len(tokens)
+        packed.append(clipped)
+        remaining -= used
+    return packed
+
+def is_search_page(url):
+    """Return True for links back to search engines rather than real results"""
+    parsed = urlparse(url)
+    labels = (parsed.hostname or '').split('.')
+    domains = {'.'.join(labels[i:]) for i in range(len(labels))}
+    if domains & SKIP_DOMAINS:
+        return True
+    return 'youtube.com' in domains and parsed.path.startswith('/results')
+
+def now_iso():
+    """Local time as an ISO 8601 string (seconds precision)"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime())
+
+def file_stamp(iso_timestamp):
+    """Turn a now_iso() timestamp into a file-name friendly YYYYmmdd_HHMMSS"""
+    return iso_timestamp.replace('-', '').replace(':', '').replace('T', '_')
+
+class UnsupportedContentError(Exception):
+    """Raised when a scraped URL doesn't serve HTML"""
+
+def canonical_url(url):
+    """Drop tracking parameters and fragments so URL variants share cache entries"""
+    parsed = urlparse(url)
+    query = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+             if not key.lower().startswith(TRACKING_PARAM_PREFIXES)]
+    return urlunparse(parsed._replace(query=urlencode(query), fragment=''))
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL, max_entries=CACHE_SIZE)
+def fetch_page_text(cache_key, max_chars, _http, _url):
+    """Fetch _url and return its main text content, cached under cache_key
+
+    cache_key is the canonical form of _url, so tracking-parameter variants
+    share an entry while the page itself is fetched from the original URL.
+    Failures raise instead of returning a message so that they aren't cached.
+    """
+    with _http.stream("GET", _url) as response:
+        response.raise_for_status()
+        
+        # Don't download PDFs, images and other non-HTML bodies
+        content_type = response.headers.get('Content-Type', '').lower()
+        if content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+            raise UnsupportedContentError(f"non-HTML content ({content_type})")
+        
+        # Only the beginning of the page is needed for max_chars of text
+        body = bytearray()
+        for chunk in response.iter_bytes():
+            body.extend(chunk)
+            if len(body) >= MAX_PAGE_BYTES:
+                break
+        # lexbor assumes UTF-8, so decode with the charset the server declared
+        html = body[:MAX_PAGE_BYTES].decode(response.encoding or 'utf-8', 'replace')
+    
+    tree = parse_html(html)
+    
+    # Remove unwanted elements
+    strip_tags(tree, STRIPPED_TAGS)
+    
+    # Try to find main content
+    main_content = None
+    
+    for selector in CONTENT_SELECTORS:
+        main_content = css_first(tree, selector)
+        if main_content:
+            break
+    
+    # If no main content found, use body
+    if not main_content:
+        main_content = document_body(tree)
+    
+    # Join stripped text fragments and collapse remaining whitespace
+    text = WHITESPACE_RE.sub(' ', node_text(main_content, separator=' ')).strip()
+    
+    if len(text) > max_chars:
+        text = text[:max_chars] + "..."
+    
+    return text
+
+def results_json(results):
+    """JSON export of a finished search"""
+    return json.dumps(results, indent=2, ensure_ascii=False)
+
+def results_report(results):
+    """Plain-text export of a finished search"""
+    parts = [
+        "Search Results Report\n",
+        f"Query: {results['query']}\n",
+        f"Timestamp: {results['timestamp']}\n",
+        f"Results Found: {len(results.get('search_results', []))}\n\n",
+        f"Summary:\n{results.get('summary', 'No summary available')}\n\n",
+    ]
+    for i, result in enumerate(results.get('scraped_content', []), 1):
+        parts.append(f"{i}. {result['title']}\n")
+        parts.append(f"URL: {result['url']}\n")
+        parts.append(f"Content: {result['content'][:500]}...\n\n")
+    return "".join(parts)
+
+class TimedCache:
+    """Thread-safe dict cache with a TTL and an entry limit (oldest evicted first)"""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.time() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def put(self, key, value):
+        """Store value under key, evicting the oldest entry when full"""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                del self._entries[min(self._entries, key=lambda k: self._entries[k][0])]
+            self._entries[key] = (time.time(), value)
+
+class LatestSlot:
+    """Thread-safe single-value slot; put overwrites, get takes the value out"""
+
+    def __init__(self):
+        self._value = None
+        self._lock = threading.Lock()
+
+    def put(self, value):
+        """Replace the held value"""
+        with self._lock:
+            self._value = value
+
+    def get(self):
+        """Return the held value (or None) and empty the slot"""
+        with self._lock:
+            value, self._value = self._value, None
+        return value
+
+@st.cache_resource(show_spinner=False)
+def summary_cache():
+    """Process-wide cache of generated summaries"""
+    return TimedCache(CACHE_TTL, CACHE_SIZE)
+
+@st.cache_resource(show_spinner=False)
+def search_cache():
+    """Process-wide cache of complete search results"""
+    return TimedCache(SEARCH_CACHE_TTL, SEARCH_CACHE_SIZE)
+
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key: str):
+    """Create and verify an OpenAI client, shared across reruns and sessions"""
+    client = OpenAI(api_key=api_key)
+    # Test the connection with a simple request (only once per key)
+    client.models.list()
+    return client
+
+def block_heavy_resources(route):
+    """Abort subresources that don't affect result extraction"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+class PlaywrightWorker(threading.Thread):
+    """Long-lived thread that owns the sync Playwright browser
+
+    Sync Playwright objects can only be used from the thread that created
+    them, and Streamlit runs every rerun on a new thread, so all browser work
+    is submitted here. Jobs are called as fn(context, *args) and each job
+    should open (and close) its own page on the shared context.
+    """
+
+    def __init__(self):
+        super().__init__(name="playwright-worker", daemon=True)
+        self.jobs = queue.Queue()
+
+    def submit(self, fn, *args):
+        """Queue fn(context, *args) on the browser thread and return a Future"""
+        future = Future()
+        self.jobs.put((future, fn, args))
+        return future
+
+    def _new_context(self, browser):
+        """Create an isolated context (own cookies and storage) for one job"""
+        context = browser.new_context(
+            viewport={"width": 1280, "height": 720},
+            user_agent=BROWSER_USER_AGENT
+        )
+        context.route("**/*", block_heavy_resources)
+        context.route(TRACKER_URL_RE, lambda route: route.abort())
+        return context
+
+    def run(self):
+        try:
+            with sync_playwright() as playwright:
+                browser = None
+                while True:
+                    future, fn, args = self.jobs.get()
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        # (Re)launch lazily, e.g. after the browser crashed
+                        if browser is None or not browser.is_connected():
+                            browser = playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+                        context = self._new_context(browser)
+                        try:
+                            future.set_result(fn(context, *args))
+                        finally:
+                            context.close()
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+        except Exception as e:
+            # Playwright itself failed to start; fail every queued and future job
+            while True:
+                future, fn, args = self.jobs.get()
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+
+@st.cache_resource(show_spinner=False)
+def get_playwright_worker():
+    """Start the browser worker thread once per server process"""
+    worker = PlaywrightWorker()
+    worker.start()
+    return worker
+
 @dataclass
 class ActivityLog:
     timestamp: str
@@ -93,27 +606,71 @@ class StreamlitBrowserSearchBot:
         self.tools = []
         self.search_results = []
         self.scraped_content = []
-        self.activity_queue = queue.Queue()
-        self.screenshot_queue = queue.Queue()
+        # Bounded so long sessions can't grow the log without limit
+        self._log = collections.deque(maxlen=LOG_WINDOW)
+        self._log_lock = threading.Lock()
+        self.screenshot_slot = LatestSlot()
         self.current_status = "idle"
+        # Cleared when any part of the current answer failed or came from a fallback
+        self.cacheable = False
+        self.http = self._create_http_session()
+        # Close the pooled client when the session's bot is discarded, or at interpreter exit
+        self._close_http = weakref.finalize(self, self.http.close)
+        self.browser = get_playwright_worker()
+
+    def _create_http_session(self):
+        """Create a pooled HTTP/2 client so scrapes reuse (and multiplex) connections"""
+        transport = httpx.HTTPTransport(
+            http2=True,
+            retries=2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+        )
+        return httpx.Client(
+            transport=transport,
+            headers=HTTP_HEADERS,
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            follow_redirects=True
+        )
+
+    def close(self):
+        """Release pooled network resources (safe to call more than once)"""
+        self._close_http()
+
+    def reset_query_state(self):
+        """Forget the last query's results, logs and frames, keeping clients and browser warm"""
+        self.search_results = []
+        self.scraped_content = []
+        self.current_status = "idle"
+        with self._log_lock:
+            self._log.clear()
+        self.screenshot_slot.get()
         
     def log_activity(self, action_type: str, description: str, details: str = ""):
         """Log activity for UI display"""
-        log_entry = ActivityLog(
-            timestamp=datetime.now().strftime("%H:%M:%S"),
-            action_type=action_type,
-            description=description,
-            details=details
-        )
-        self.activity_queue.put(log_entry)
+        # Stored as a plain tuple; ActivityLog is only built when drained for display
+        with self._log_lock:
+            self._log.append((time.time(), action_type, description, details))
+
+    def drain_logs(self):
+        """Return and clear all log entries recorded since the last drain"""
+        with self._log_lock:
+            entries = list(self._log)
+            self._log.clear()
+        return [
+            ActivityLog(
+                timestamp=time.strftime("%H:%M:%S", time.localtime(created)),
+                action_type=action_type,
+                description=description,
+                details=details
+            )
+            for created, action_type, description, details in entries
+        ]
         
     def initialize_openai(self, api_key: str):
         """Initialize OpenAI client with provided API key"""
         try:
             os.environ["OPENAI_API_KEY"] = api_key
-            self.client = OpenAI(api_key=api_key)
-            # Test the connection with a simple request
-            self.client.models.list()
+            self.client = get_openai_client(api_key)
             return True, "OpenAI client initialized successfully!"
         except Exception as e:
             return False, f"Failed to initialize OpenAI: {str(e)}"
@@ -134,31 +691,30 @@ class StreamlitBrowserSearchBot:
                     pass
             
             html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = parse_html(html_content)
             
             results = []
             # Updated selectors for current Google layout
-            search_containers = soup.select('div.g, div.tF2Cxc, div.MjjYud, div[data-sokoban-container] div.g')
+            search_containers = css_select(tree, GOOGLE_RESULT_SELECTOR)
             
             self.log_activity("INFO", f"Found {len(search_containers)} potential result containers")
             
             for container in search_containers[:10]:
                 try:
                     # Try multiple selectors for title
-                    title_element = container.select_one('h3, .LC20lb, .DKV0Md')
-                    title = title_element.get_text().strip() if title_element else "No title"
+                    title_element = css_first(container, GOOGLE_TITLE_SELECTOR)
+                    title = node_text(title_element) if title_element else "No title"
                     
                     # Try multiple selectors for link
-                    link_element = container.select_one('a[href]')
+                    link_element = css_first(container, 'a[href]')
                     url = ""
                     if link_element:
-                        url = link_element.get('href', '')
+                        url = node_attr(link_element, 'href')
                         
                         # Clean up Google redirect URLs
                         if url.startswith('/url?'):
-                            import urllib.parse
                             try:
-                                parsed = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+                                parsed = parse_qs(urlparse(url).query)
                                 url = parsed.get('q', [''])[0]
                             except:
                                 continue
@@ -166,15 +722,15 @@ class StreamlitBrowserSearchBot:
                             continue
                     
                     # Try multiple selectors for snippet
-                    snippet_element = container.select_one('.VwiC3b, .s3v9rd, .IsZvec, .aCOpRe, .st')
-                    snippet = snippet_element.get_text().strip() if snippet_element else "No description"
+                    snippet_element = css_first(container, GOOGLE_SNIPPET_SELECTOR)
+                    snippet = node_text(snippet_element) if snippet_element else "No description"
                     
                     # Validate result
                     if (title != "No title" and 
                         url and 
                         url.startswith('http') and 
                         len(title) > 0 and
-                        not any(skip in url.lower() for skip in ['google.com', 'youtube.com/results'])):
+                        not is_search_page(url)):
                         
                         results.append({
                             'title': title,
@@ -202,51 +758,13 @@ class StreamlitBrowserSearchBot:
             if not url or not url.startswith('http'):
                 return f"Invalid URL: {url}"
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
             try:
-                response = requests.get(url, headers=headers, timeout=15, allow_redirects=True)
-                response.raise_for_status()
-            except requests.exceptions.RequestException as e:
+                text = fetch_page_text(canonical_url(url), max_chars, self.http, _url=url)
+            except httpx.HTTPError as e:
                 return f"Failed to fetch {url}: {str(e)}"
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for script in soup(["script", "style", "nav", "footer", "header", "aside", "iframe", "noscript"]):
-                script.decompose()
-            
-            # Try to find main content
-            content_selectors = ['main', 'article', '.content', '#content', '.post', '.entry']
-            main_content = None
-            
-            for selector in content_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            # If no main content found, use body
-            if not main_content:
-                main_content = soup.find('body') or soup
-            
-            text = main_content.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            if len(text) > max_chars:
-                text = text[:max_chars] + "..."
+            except UnsupportedContentError as e:
+                self.log_activity("WARNING", f"Skipping {e} from {url[:30]}...")
+                return f"Skipped {e} at {url}"
             
             self.log_activity("SUCCESS", f"Scraped {len(text)} characters from {url[:30]}...")
             return text
@@ -256,525 +774,479 @@ class StreamlitBrowserSearchBot:
             self.log_activity("ERROR", error_msg)
             return f"Could not scrape content from {url}: {str(e)}"
 
+    def start_scrapes(self, results, max_results, label="result"):
+        """Start fetching result pages in the background and return the pending jobs"""
+        targets = results[:max_results]
+        if not targets:
+            return []
+        
+        for i, result in enumerate(targets):
+            self.log_activity("PROGRESS", f"Scraping {label} {i+1}/{len(targets)}: {result['title'][:50]}...")
+        
+        # Cap parallel requests per host so result lists dominated by one site stay polite
+        host_limits = {}
+        for result in targets:
+            host = urlparse(result['url']).hostname or ''
+            host_limits.setdefault(host, threading.BoundedSemaphore(MAX_SCRAPES_PER_HOST))
+        
+        executor = ThreadPoolExecutor(max_workers=min(MAX_SCRAPE_WORKERS, len(targets)))
+        jobs = [
+            (result, executor.submit(self._scrape_with_limit, result['url'],
+                                     host_limits[urlparse(result['url']).hostname or '']))
+            for result in targets
+        ]
+        # Submitted fetches keep running; the workers exit once they are done
+        executor.shutdown(wait=False)
+        return jobs
+
+    def _scrape_with_limit(self, url, host_limit):
+        """Scrape a page while holding one of its host's request slots"""
+        with host_limit:
+            return self.scrape_webpage_content(url)
+
+    def collect_scrapes(self, jobs, label="result"):
+        """Wait for scrape jobs and return their content, keeping the original result order"""
+        scraped = []
+        for i, (result, future) in enumerate(jobs):
+            try:
+                scraped.append({
+                    'title': result['title'],
+                    'url': result['url'],
+                    'snippet': result['snippet'],
+                    'content': future.result()
+                })
+            except Exception as e:
+                self.log_activity("WARNING", f"Failed to scrape {label} {i+1}: {str(e)}")
+        
+        # A summary of error messages alone must not be shared through the search cache
+        if all(item['content'].startswith(SCRAPE_FAILURE_PREFIXES) for item in scraped):
+            self.cacheable = False
+        return scraped
+
+    def summarize_scrapes(self, query, scrape_jobs, label="result"):
+        """Summarize scraped pages while the slowest scrapes are still finishing
+
+        The summary starts once a quorum of pages has arrived (plus a short
+        grace period for the rest). Pages that arrive later are still added to
+        the results but aren't part of the summary. Returns None when nothing
+        was scraped.
+        """
+        futures = [future for _, future in scrape_jobs]
+        quorum = max(2, len(futures) // 2)
+        pending = set(futures)
+        while pending and len(futures) - len(pending) < quorum:
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        if pending:
+            _, pending = wait(pending, timeout=STRAGGLER_GRACE_SECONDS)
+        
+        self.scraped_content = self.collect_scrapes(
+            [job for job in scrape_jobs if job[1] not in pending], label)
+        if not self.scraped_content:
+            return None
+        
+        if pending:
+            self.log_activity("INFO", f"Summarizing while {len(pending)} slow page(s) finish loading...")
+        summary = self.generate_summary(query)
+        
+        if pending:
+            # Keep the late pages (in result order) for the results view
+            self.scraped_content = self.collect_scrapes(scrape_jobs, label)
+        return summary
+
     def get_screenshot(self, page):
-        """Take screenshot and add to queue"""
+        """Take screenshot and make it the latest one shown in the UI"""
         try:
-            screenshot_bytes = page.screenshot(full_page=False)
-            screenshot_base64 = base64.b64encode(screenshot_bytes).decode("utf-8")
+            # Capture losslessly so the preview JPEG below is the only lossy encode
+            raw = page.screenshot(type='png', full_page=False)
             
-            # Clear old screenshots and add new one
-            while not self.screenshot_queue.empty():
-                try:
-                    self.screenshot_queue.get_nowait()
-                except queue.Empty:
-                    break
+            # Shrink here, on the browser thread, so the UI only passes bytes on
+            image = Image.open(BytesIO(raw))
+            image.thumbnail(PREVIEW_SIZE)
+            buffer = BytesIO()
+            image.save(buffer, format='JPEG', quality=60)
+            screenshot_bytes = buffer.getvalue()
             
-            self.screenshot_queue.put(screenshot_base64)
+            self.screenshot_slot.put(screenshot_bytes)
             return screenshot_bytes
         except Exception as e:
             self.log_activity("ERROR", f"Error taking screenshot: {str(e)}")
             return None
 
+    def start_screencast(self, context, page):
+        """Have Chromium push JPEG frames of page into the screenshot slot
+
+        Returns False if the screencast could not be started, in which case
+        callers fall back to get_screenshot.
+        """
+        try:
+            cdp = context.new_cdp_session(page)
+
+            def on_frame(frame):
+                self.screenshot_slot.put(base64.b64decode(frame["data"]))
+                cdp.send("Page.screencastFrameAck", {"sessionId": frame["sessionId"]})
+
+            cdp.on("Page.screencastFrame", on_frame)
+            cdp.send("Page.startScreencast", SCREENCAST_OPTIONS)
+            return True
+        except Exception as e:
+            self.log_activity("WARNING", f"Live view unavailable, using screenshots: {str(e)}")
+            return False
+
+    def stream_chat(self, messages, max_tokens=1000):
+        """Stream a chat completion, yielding content deltas as they arrive"""
+        response = self.client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            stream=True
+        )
+        for chunk in response:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+
     def generate_summary(self, query):
-        """Generate AI summary of results"""
+        """Generate AI summary of results, streaming it into the page as it arrives"""
         if not self.scraped_content:
+            self.cacheable = False
             return "No search results found to summarize."
 
+        cache = summary_cache()
+        cache_key = (query, tuple(sorted(canonical_url(result['url']) for result in self.scraped_content)))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            self.log_activity("AI", "Using cached summary for these results")
+            return cached
+
         self.log_activity("AI", "Generating summary with OpenAI...")
         
-        content_text = f"Search Query: {query}\n\nSearch Results:\n"
+        parts = [f"Search Query: {query}\n\nSearch Results:\n"]
         
-        for i, result in enumerate(self.scraped_content, 1):
-            content_text += f"\n{i}. {result['title']}\n"
-            content_text += f"URL: {result['url']}\n"
-            content_text += f"Snippet: {result['snippet']}\n"
-            content_text += f"Content: {result['content'][:800]}...\n"  # Increased content length
-            content_text += "-" * 80 + "\n"
+        contents = pack_tokens(
+            [result['content'] for result in self.scraped_content],
+            SUMMARY_TOKENS_PER_RESULT, SUMMARY_TOKEN_BUDGET
+        )
+        
+        for i, (result, content) in enumerate(zip(self.scraped_content, contents), 1):
+            parts.append(f"\n{i}. {result['title']}\n")
+            parts.append(f"URL: {result['url']}\n")
+            parts.append(f"Snippet: {result['snippet']}\n")
+            if content:
+                parts.append(f"Content: {content}...\n")
+            parts.append("-" * 80 + "\n")
+        
+        content_text = "".join(parts)
 
         try:
-            summary_response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Use more cost-effective model
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that creates concise, informative summaries of web search results. Provide a comprehensive summary that covers the key points from all the search results. Focus on the most important and relevant information."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Please provide a comprehensive summary of these search results for the query '{query}':\n\n{content_text}"
-                    }
-                ],
-                max_tokens=1000,
-                temperature=0.3
-            )
+            summary = st.write_stream(self.stream_chat([
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that creates concise, informative summaries of web search results. Provide a comprehensive summary that covers the key points from all the search results. Focus on the most important and relevant information."
+                },
+                {
+                    "role": "user",
+                    "content": f"Please provide a comprehensive summary of these search results for the query '{query}':\n\n{content_text}"
+                }
+            ]))
+            
+            cache.put(cache_key, summary)
             
-            summary = summary_response.choices[0].message.content
             self.log_activity("SUCCESS", "AI summary generated successfully")
             return summary
             
         except Exception as e:
+            self.cacheable = False
             error_msg = f"Error generating summary: {str(e)}"
             self.log_activity("ERROR", error_msg)
             return f"Could not generate summary due to an error: {str(e)}"
 
-    def search_with_google(self, query, max_results=5):
-        """Original Google search method (kept for compatibility)"""
-        self.current_status = "running"
-        self.search_results = []
-        self.scraped_content = []
-        
-        self.log_activity("START", f"Starting Google search for: {query}")
-        self.log_activity("WARNING", "Google may block automated requests with CAPTCHA")
-        
-        try:
-            with sync_playwright() as p:
-                self.log_activity("BROWSER", "Launching Chrome browser...")
-                
-                # Updated browser launch options
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-gpu",
-                        "--disable-extensions",
-                        "--disable-file-system",
-                        "--disable-web-security",
-                        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                    ]
-                )
+    def _detect_captcha(self, page):
+        """Check the rendered page text for a CAPTCHA / bot-detection notice
 
-                context = browser.new_context(
-                    viewport={"width": 1280, "height": 720},
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                )
-                
-                page = context.new_page()
+        Runs inside the browser so the DOM isn't serialized back to Python.
+        """
+        return page.evaluate(CAPTCHA_CHECK_JS)
 
-                self.log_activity("BROWSER", "Navigating to Google...")
-                try:
-                    page.goto("https://www.google.com", wait_until="domcontentloaded", timeout=30000)
-                except PlaywrightTimeoutError:
-                    page.goto("https://www.google.com", wait_until="networkidle", timeout=30000)
+    def _serp_page(self, context, engine, query, max_results):
+        """Run a search in a new page on the browser worker
 
-                # Check for CAPTCHA or unusual traffic detection
-                page_content = page.content().lower()
-                if "captcha" in page_content or "unusual traffic" in page_content or "not a robot" in page_content:
-                    self.log_activity("ERROR", "Google detected automated traffic (CAPTCHA shown)")
-                    browser.close()
-                    # Fallback to DuckDuckGo
-                    return self.search_with_duckduckgo(query, max_results)
+        Returns (search_results, scrape_jobs), or None when the engine blocked
+        the search and the caller should fall back.
+        """
+        spec = SEARCH_ENGINES[engine]
+        name = spec['name']
+        page = context.new_page()
+        screencast = self.start_screencast(context, page)
+        try:
+            self.log_activity("BROWSER", f"Navigating to {name}...")
+            try:
+                page.goto(spec['url'], wait_until="domcontentloaded", timeout=30000)
+            except PlaywrightTimeoutError:
+                page.goto(spec['url'], wait_until="networkidle", timeout=30000)
 
-                # Handle potential cookie consent
+            # Check for CAPTCHA or unusual traffic detection
+            if spec['captcha_check'] and self._detect_captcha(page):
+                self.log_activity("ERROR", f"{name} detected automated traffic (CAPTCHA shown)")
+                return None
+
+            # Handle potential cookie consent
+            if spec['cookie_consent']:
                 try:
-                    cookie_button = page.locator("button:has-text('Accept all'), button:has-text('I agree'), #L2AGLb")
+                    cookie_button = page.locator(spec['cookie_consent'])
                     if cookie_button.is_visible(timeout=3000):
                         cookie_button.click(timeout=5000)
                         self.log_activity("BROWSER", "Accepted cookie consent")
                 except:
                     pass
 
-                self.log_activity("BROWSER", f"Searching for: {query}")
-                
-                # More robust search input handling
-                search_selectors = [
-                    "textarea[name='q']",
-                    "input[name='q']", 
-                    "textarea[title='Search']",
-                    "input[title='Search']",
-                    "#APjFqb",
-                    ".gLFyf"
-                ]
-                
+            self.log_activity("BROWSER", f"Searching for: {query}")
+            
+            # is_visible() doesn't wait, so wait for whichever candidate input shows up first
+            search_input = page.locator(", ".join(f"{selector}:visible" for selector in spec['input_selectors'])).first
+            try:
+                search_input.wait_for(state="visible", timeout=10000)
+                self.log_activity("BROWSER", f"Found {name} search input")
+            except PlaywrightTimeoutError:
                 search_input = None
-                for selector in search_selectors:
-                    try:
-                        search_input = page.locator(selector).first
-                        if search_input.is_visible(timeout=5000):
-                            self.log_activity("BROWSER", f"Found search input with selector: {selector}")
-                            break
-                    except PlaywrightTimeoutError:
-                        continue
-                
-                if not search_input:
-                    self.log_activity("ERROR", "Could not find Google search input - likely blocked")
-                    browser.close()
-                    return self.search_with_duckduckgo(query, max_results)
-                
-                # Clear any existing text and type the query
-                try:
+            
+            if not search_input:
+                self.log_activity("ERROR", f"Could not find {name} search input - likely blocked")
+                return None
+            
+            try:
+                if spec['type_delay']:
+                    # Clear any existing text and type the query
                     search_input.click(timeout=10000)
-                    search_input.fill("", timeout=5000)  # Clear first
-                    search_input.type(query, delay=50)  # Type with small delay
-                    search_input.press("Enter", timeout=10000)
-                except Exception as e:
-                    self.log_activity("ERROR", f"Error during search input: {str(e)}")
-                    browser.close()
-                    return self.search_with_duckduckgo(query, max_results)
-
-                # Wait for results to load
-                try:
-                    page.wait_for_load_state("domcontentloaded", timeout=30000)
-                    page.wait_for_timeout(3000)
-                except PlaywrightTimeoutError:
-                    self.log_activity("WARNING", "Timeout waiting for page load")
-
-                # Check again for CAPTCHA after search
-                page_content = page.content().lower()
-                if "captcha" in page_content or "unusual traffic" in page_content:
-                    self.log_activity("ERROR", "Google showed CAPTCHA after search")
-                    browser.close()
-                    return self.search_with_duckduckgo(query, max_results)
+                    search_input.fill("", timeout=5000)
+                    search_input.type(query, delay=spec['type_delay'])
+                else:
+                    search_input.fill(query, timeout=5000)
+                search_input.press("Enter", timeout=10000)
+            except Exception as e:
+                self.log_activity("ERROR", f"Error during search input: {str(e)}")
+                return None
 
-                # Take screenshot after search
-                screenshot_bytes = self.get_screenshot(page)
-                if screenshot_bytes:
-                    self.log_activity("SCREENSHOT", "Captured search results page")
+            # Wait for results to load
+            try:
+                page.wait_for_load_state("domcontentloaded", timeout=30000)
+                page.wait_for_timeout(3000)
+            except PlaywrightTimeoutError:
+                self.log_activity("WARNING", "Timeout waiting for page load")
 
-                self.log_activity("SCRAPING", "Extracting search results...")
-                self.search_results = self.extract_google_results(page)
+            # Check again for CAPTCHA after search
+            if spec['captcha_check'] and self._detect_captcha(page):
+                self.log_activity("ERROR", f"{name} showed CAPTCHA after search")
+                return None
 
-                browser.close()
+            self.log_activity("SCRAPING", f"Extracting {name} search results...")
+            self.search_results = getattr(self, spec['extractor'])(page)
 
-                if not self.search_results:
-                    self.log_activity("WARNING", "No Google results found, switching to DuckDuckGo")
-                    return self.search_with_duckduckgo(query, max_results)
+            if not self.search_results and not spec['fallback_engine']:
+                self.log_activity("WARNING", f"No {name} results found, trying fallback method...")
+                # Fallback to direct API search
+                self.search_results = self.fallback_search_api(query)
 
+            # Start fetching result pages while the page is still open
+            scrape_jobs = []
+            if self.search_results:
                 self.log_activity("INFO", f"Starting to scrape {min(max_results, len(self.search_results))} results...")
-                
-                for i, result in enumerate(self.search_results[:max_results]):
-                    try:
-                        self.log_activity("PROGRESS", f"Scraping result {i+1}/{min(max_results, len(self.search_results))}: {result['title'][:50]}...")
-                        content = self.scrape_webpage_content(result['url'])
-                        self.scraped_content.append({
-                            'title': result['title'],
-                            'url': result['url'],
-                            'snippet': result['snippet'],
-                            'content': content
-                        })
-                    except Exception as e:
-                        self.log_activity("WARNING", f"Failed to scrape result {i+1}: {str(e)}")
-                        continue
+                scrape_jobs = self.start_scrapes(self.search_results, max_results)
+
+            # The screencast already streams frames; otherwise take one screenshot
+            if not screencast and self.get_screenshot(page):
+                self.log_activity("SCREENSHOT", f"Captured {name} results page")
+            return self.search_results, scrape_jobs
+        finally:
+            page.close()
+
+    def _search_fallback(self, engine, query, max_results):
+        """Continue with the engine's fallback after it failed"""
+        fallback_engine = SEARCH_ENGINES[engine]['fallback_engine']
+        if fallback_engine:
+            return self._run_search(fallback_engine, query, max_results)
+        return self.fallback_search_and_summarize(query, max_results)
+
+    def _run_search(self, engine, query, max_results=5):
+        """Search with a browser-driven engine, then scrape and summarize the results"""
+        spec = SEARCH_ENGINES[engine]
+        name = spec['name']
+        self.current_status = "running"
+        self.search_results = []
+        self.scraped_content = []
+        
+        self.log_activity("START", f"Starting {name} search for: {query}")
+        if spec['captcha_check']:
+            self.log_activity("WARNING", f"{name} may block automated requests with CAPTCHA")
+        
+        try:
+            job = self.browser.submit(self._serp_page, engine, query, max_results)
+            try:
+                serp = job.result(timeout=BROWSER_JOB_TIMEOUT)
+            except FutureTimeoutError:
+                # Drop the job if it hasn't started yet; a stuck one can't be interrupted
+                job.cancel()
+                self.log_activity("ERROR", f"{name} browser search timed out after {BROWSER_JOB_TIMEOUT}s")
+                return self._search_fallback(engine, query, max_results)
+            if serp is None:
+                return self._search_fallback(engine, query, max_results)
+            self.search_results, scrape_jobs = serp
+
+            if not self.search_results:
+                self.log_activity("WARNING", f"No {name} results found, using fallback")
+                return self._search_fallback(engine, query, max_results)
 
-            if not self.scraped_content:
-                self.log_activity("WARNING", "No content scraped from Google, using fallback")
-                return self.search_with_duckduckgo(query, max_results)
+            summary = self.summarize_scrapes(query, scrape_jobs)
 
-            summary = self.generate_summary(query)
+            if summary is None:
+                self.log_activity("WARNING", f"No content scraped from {name}, using fallback")
+                return self._search_fallback(engine, query, max_results)
             
             self.current_status = "complete"
-            self.log_activity("COMPLETE", "Google search completed successfully!")
+            self.log_activity("COMPLETE", f"{name} search completed successfully!")
             
             return {
                 'query': query,
                 'search_results': self.search_results,
                 'scraped_content': self.scraped_content,
                 'summary': summary,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
             
         except Exception as e:
             self.current_status = "error"
-            error_msg = f"Error during Google search: {str(e)}"
+            error_msg = f"Error during {name} search: {str(e)}"
             self.log_activity("ERROR", error_msg)
-            # Fallback to DuckDuckGo
-            return self.search_with_duckduckgo(query, max_results)
-
-    def search_with_duckduckgo(self, query, max_results=5):
-        """Original Google search method (kept for compatibility)"""
-        self.current_status = "running"
-        self.search_results = []
-        self.scraped_content = []
-        
-        self.log_activity("START", f"Starting Google search for: {query}")
-        self.log_activity("WARNING", "Google may block automated requests with CAPTCHA")
-        
-        try:
-            with sync_playwright() as p:
-                self.log_activity("BROWSER", "Launching Chrome browser...")
-                
-                # Updated browser launch options
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-gpu",
-                        "--disable-extensions",
-                        "--disable-file-system",
-                        "--disable-web-security",
-                        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                    ]
-                )
+            return self._search_fallback(engine, query, max_results)
 
-                context = browser.new_context(
-                    viewport={"width": 1280, "height": 720},
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                )
-                
-                page = context.new_page()
-
-                self.log_activity("BROWSER", "Navigating to Google...")
-                try:
-                    page.goto("https://www.google.com", wait_until="domcontentloaded", timeout=30000)
-                except PlaywrightTimeoutError:
-                    page.goto("https://www.google.com", wait_until="networkidle", timeout=30000)
+    def search_with_google(self, query, max_results=5):
+        """Google search; falls back to DuckDuckGo when blocked"""
+        return self._run_search('google', query, max_results)
 
-                # Check for CAPTCHA or unusual traffic detection
-                page_content = page.content().lower()
-                if "captcha" in page_content or "unusual traffic" in page_content or "not a robot" in page_content:
-                    self.log_activity("ERROR", "Google detected automated traffic (CAPTCHA shown)")
-                    browser.close()
-                    # Fallback to DuckDuckGo
-                    return self.search_with_duckduckgo(query, max_results)
+    def search_with_duckduckgo(self, query, max_results=5):
+        """Alternative search using DuckDuckGo (more bot-friendly)"""
+        return self._run_search('duckduckgo', query, max_results)
 
-                # Handle potential cookie consent
+    def extract_duckduckgo_html_results(self, html_content):
+        """Extract search results from DuckDuckGo's JavaScript-free HTML page"""
+        try:
+            tree = parse_html(html_content)
+            
+            results = []
+            search_containers = css_select(tree, DUCKDUCKGO_HTML_RESULT_SELECTOR)
+            
+            self.log_activity("INFO", f"Found {len(search_containers)} DuckDuckGo result containers")
+            
+            for container in search_containers[:10]:
                 try:
-                    cookie_button = page.locator("button:has-text('Accept all'), button:has-text('I agree'), #L2AGLb")
-                    if cookie_button.is_visible(timeout=3000):
-                        cookie_button.click(timeout=5000)
-                        self.log_activity("BROWSER", "Accepted cookie consent")
-                except:
-                    pass
-
-                self.log_activity("BROWSER", f"Searching for: {query}")
-                
-                # More robust search input handling
-                search_selectors = [
-                    "textarea[name='q']",
-                    "input[name='q']", 
-                    "textarea[title='Search']",
-                    "input[title='Search']",
-                    "#APjFqb",
-                    ".gLFyf"
-                ]
-                
-                search_input = None
-                for selector in search_selectors:
-                    try:
-                        search_input = page.locator(selector).first
-                        if search_input.is_visible(timeout=5000):
-                            self.log_activity("BROWSER", f"Found search input with selector: {selector}")
-                            break
-                    except PlaywrightTimeoutError:
+                    title_element = css_first(container, '.result__a')
+                    if not title_element:
                         continue
-                
-                if not search_input:
-                    self.log_activity("ERROR", "Could not find Google search input - likely blocked")
-                    browser.close()
-                    return self.search_with_duckduckgo(query, max_results)
-                
-                # Clear any existing text and type the query
-                try:
-                    search_input.click(timeout=10000)
-                    search_input.fill("", timeout=5000)  # Clear first
-                    search_input.type(query, delay=50)  # Type with small delay
-                    search_input.press("Enter", timeout=10000)
-                except Exception as e:
-                    self.log_activity("ERROR", f"Error during search input: {str(e)}")
-                    browser.close()
-                    return self.search_with_duckduckgo(query, max_results)
-
-                # Wait for results to load
-                try:
-                    page.wait_for_load_state("domcontentloaded", timeout=30000)
-                    page.wait_for_timeout(3000)
-                except PlaywrightTimeoutError:
-                    self.log_activity("WARNING", "Timeout waiting for page load")
-
-                # Check again for CAPTCHA after search
-                page_content = page.content().lower()
-                if "captcha" in page_content or "unusual traffic" in page_content:
-                    self.log_activity("ERROR", "Google showed CAPTCHA after search")
-                    browser.close()
-                    return self.search_with_duckduckgo(query, max_results)
-
-                # Take screenshot after search
-                screenshot_bytes = self.get_screenshot(page)
-                if screenshot_bytes:
-                    self.log_activity("SCREENSHOT", "Captured search results page")
-
-                self.log_activity("SCRAPING", "Extracting search results...")
-                self.search_results = self.extract_google_results(page)
-
-                browser.close()
-
-                if not self.search_results:
-                    self.log_activity("WARNING", "No Google results found, switching to DuckDuckGo")
-                    return self.search_with_duckduckgo(query, max_results)
-
-                self.log_activity("INFO", f"Starting to scrape {min(max_results, len(self.search_results))} results...")
-                
-                for i, result in enumerate(self.search_results[:max_results]):
-                    try:
-                        self.log_activity("PROGRESS", f"Scraping result {i+1}/{min(max_results, len(self.search_results))}: {result['title'][:50]}...")
-                        content = self.scrape_webpage_content(result['url'])
-                        self.scraped_content.append({
-                            'title': result['title'],
-                            'url': result['url'],
-                            'snippet': result['snippet'],
-                            'content': content
+                    title = node_text(title_element)
+                    
+                    # Links go through DuckDuckGo's redirector: //duckduckgo.com/l/?uddg=<url>
+                    url = node_attr(title_element, 'href')
+                    if '/l/?' in url:
+                        url = parse_qs(urlparse(url).query).get('uddg', [''])[0]
+                    
+                    snippet_element = css_first(container, '.result__snippet')
+                    snippet = node_text(snippet_element) if snippet_element else "No description"
+                    
+                    if title and url.startswith('http'):
+                        results.append({
+                            'title': title,
+                            'url': url,
+                            'snippet': snippet
                         })
-                    except Exception as e:
-                        self.log_activity("WARNING", f"Failed to scrape result {i+1}: {str(e)}")
-                        continue
-
-            if not self.scraped_content:
-                self.log_activity("WARNING", "No content scraped from Google, using fallback")
-                return self.search_with_duckduckgo(query, max_results)
-
-            summary = self.generate_summary(query)
-            
-            self.current_status = "complete"
-            self.log_activity("COMPLETE", "Google search completed successfully!")
+                        
+                except Exception as e:
+                    continue
             
-            return {
-                'query': query,
-                'search_results': self.search_results,
-                'scraped_content': self.scraped_content,
-                'summary': summary,
-                'timestamp': datetime.now().isoformat()
-            }
+            self.log_activity("SUCCESS", f"Extracted {len(results)} DuckDuckGo search results")
+            return results
             
         except Exception as e:
-            self.current_status = "error"
-            error_msg = f"Error during Google search: {str(e)}"
-            self.log_activity("ERROR", error_msg)
-            # Fallback to DuckDuckGo
-            return self.search_with_duckduckgo(query, max_results)
-        """Alternative search using DuckDuckGo (more bot-friendly)"""
+            self.log_activity("ERROR", f"Error extracting DuckDuckGo results: {str(e)}")
+            return []
+
+    def search_with_duckduckgo_http(self, query, max_results=5):
+        """DuckDuckGo search over plain HTTP, without launching a browser"""
         self.current_status = "running"
         self.search_results = []
         self.scraped_content = []
         
-        self.log_activity("START", f"Starting DuckDuckGo search for: {query}")
+        self.log_activity("START", f"Starting DuckDuckGo (HTML) search for: {query}")
         
+        # Only the results page itself falls back to the browser; later stages
+        # (scraping, the streamed summary) must not be run a second time
         try:
-            with sync_playwright() as p:
-                self.log_activity("BROWSER", "Launching Chrome browser...")
-                
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-gpu",
-                        "--disable-extensions",
-                        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                    ]
-                )
-
-                context = browser.new_context(
-                    viewport={"width": 1280, "height": 720},
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                )
-                
-                page = context.new_page()
-
-                self.log_activity("BROWSER", "Navigating to DuckDuckGo...")
-                page.goto("https://duckduckgo.com/", wait_until="domcontentloaded", timeout=30000)
-
-                self.log_activity("BROWSER", f"Searching for: {query}")
-                
-                # DuckDuckGo search input
-                search_input = page.locator("input[name='q']").first
-                search_input.fill(query)
-                search_input.press("Enter")
-                
-                # Wait for results
-                page.wait_for_load_state("domcontentloaded", timeout=30000)
-                page.wait_for_timeout(3000)
-
-                # Take screenshot
-                screenshot_bytes = self.get_screenshot(page)
-                if screenshot_bytes:
-                    self.log_activity("SCREENSHOT", "Captured DuckDuckGo results page")
-
-                self.log_activity("SCRAPING", "Extracting DuckDuckGo search results...")
-                self.search_results = self.extract_duckduckgo_results(page)
-
-                if not self.search_results:
-                    self.log_activity("WARNING", "No DuckDuckGo results found, trying fallback method...")
-                    # Fallback to direct API search
-                    self.search_results = self.fallback_search_api(query)
-
-                self.log_activity("INFO", f"Starting to scrape {min(max_results, len(self.search_results))} results...")
-                
-                for i, result in enumerate(self.search_results[:max_results]):
-                    try:
-                        self.log_activity("PROGRESS", f"Scraping result {i+1}/{min(max_results, len(self.search_results))}: {result['title'][:50]}...")
-                        content = self.scrape_webpage_content(result['url'])
-                        self.scraped_content.append({
-                            'title': result['title'],
-                            'url': result['url'],
-                            'snippet': result['snippet'],
-                            'content': content
-                        })
-                    except Exception as e:
-                        self.log_activity("WARNING", f"Failed to scrape result {i+1}: {str(e)}")
-                        continue
-
-                browser.close()
-
-            # If no content scraped, use fallback
-            if not self.scraped_content:
-                self.log_activity("INFO", "No content scraped, using fallback search method...")
-                return self.fallback_search_and_summarize(query, max_results)
-
-            summary = self.generate_summary(query)
-            
-            self.current_status = "complete"
-            self.log_activity("COMPLETE", "Search and summarization completed successfully!")
-            
-            return {
-                'query': query,
-                'search_results': self.search_results,
-                'scraped_content': self.scraped_content,
-                'summary': summary,
-                'timestamp': datetime.now().isoformat()
-            }
-            
+            response = self.http.get(DUCKDUCKGO_HTML_URL, params={'q': query}, timeout=10)
+            response.raise_for_status()
+            self.search_results = self.extract_duckduckgo_html_results(response.text)
         except Exception as e:
-            self.current_status = "error"
-            error_msg = f"Error during DuckDuckGo search: {str(e)}"
-            self.log_activity("ERROR", error_msg)
-            # Try fallback method
+            self.log_activity("ERROR", f"Error during DuckDuckGo HTML search: {str(e)}")
+            # The browser can still get through when the HTML endpoint is rate limited
+            return self.search_with_duckduckgo(query, max_results)
+        
+        if not self.search_results:
+            self.log_activity("WARNING", "No DuckDuckGo HTML results found, switching to browser search")
+            return self.search_with_duckduckgo(query, max_results)
+        
+        self.log_activity("INFO", f"Starting to scrape {min(max_results, len(self.search_results))} results...")
+        summary = self.summarize_scrapes(query, self.start_scrapes(self.search_results, max_results))
+        
+        if summary is None:
+            self.log_activity("INFO", "No content scraped, using fallback search method...")
             return self.fallback_search_and_summarize(query, max_results)
+        
+        self.current_status = "complete"
+        self.log_activity("COMPLETE", "DuckDuckGo search completed successfully!")
+        
+        return {
+            'query': query,
+            'search_results': self.search_results,
+            'scraped_content': self.scraped_content,
+            'summary': summary,
+            'timestamp': now_iso()
+        }
 
     def extract_duckduckgo_results(self, page):
         """Extract search results from DuckDuckGo"""
         try:
             html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = parse_html(html_content)
             
             results = []
-            # DuckDuckGo result selectors
-            search_containers = soup.select('article[data-testid="result"], .nrn-react-div article, .result')
+            # Stop at the first layout that matches anything
+            search_containers = []
+            for selector in DUCKDUCKGO_RESULT_SELECTORS:
+                search_containers = css_select(tree, selector, limit=10)
+                if search_containers:
+                    break
             
             self.log_activity("INFO", f"Found {len(search_containers)} DuckDuckGo result containers")
             
-            for container in search_containers[:10]:
+            for container in search_containers:
                 try:
-                    # Title
-                    title_element = container.select_one('h2 a, .result__title a, [data-testid="result-title-a"]')
-                    title = title_element.get_text().strip() if title_element else "No title"
+                    # URL first, so rejected containers cost no text extraction
+                    title_element = css_first(container, DUCKDUCKGO_TITLE_SELECTOR)
+                    if not title_element:
+                        continue
+                    url = node_attr(title_element, 'href')
+                    if not HTTP_URL_RE.match(url):
+                        continue
                     
-                    # URL
-                    url = title_element.get('href', '') if title_element else ""
+                    # Title
+                    title = node_text(title_element)
                     
                     # Snippet
-                    snippet_element = container.select_one('[data-testid="result-snippet"], .result__snippet, .result__body')
-                    snippet = snippet_element.get_text().strip() if snippet_element else "No description"
+                    snippet_element = css_first(container, DUCKDUCKGO_SNIPPET_SELECTOR)
+                    snippet = node_text(snippet_element) if snippet_element else "No description"
                     
-                    if title != "No title" and url and url.startswith('http'):
-                        results.append({
-                            'title': title,
-                            'url': url,
-                            'snippet': snippet
-                        })
+                    results.append({
+                        'title': title,
+                        'url': url,
+                        'snippet': snippet
+                    })
                         
                 except Exception as e:
                     continue
@@ -788,38 +1260,18 @@ class StreamlitBrowserSearchBot:
 
     def fallback_search_api(self, query):
         """Fallback search using a simple web search approach"""
+        # Canned results are never cached as a real search
+        self.cacheable = False
         try:
             self.log_activity("FALLBACK", "Using fallback search method...")
             
-            # Create some basic search results based on common sources
-            fallback_results = []
-            
-            # You can add more sophisticated fallback logic here
-            # For now, we'll create some example results
-            search_terms = query.lower().split()
-            
-            if any(term in ['ai', 'artificial', 'intelligence'] for term in search_terms):
-                fallback_results.extend([
-                    {
-                        'title': 'Artificial Intelligence Trends - MIT Technology Review',
-                        'url': 'https://www.technologyreview.com/topic/artificial-intelligence/',
-                        'snippet': 'Latest developments in artificial intelligence research and applications.'
-                    },
-                    {
-                        'title': 'AI News and Research - OpenAI',
-                        'url': 'https://openai.com/blog',
-                        'snippet': 'Research updates and insights from OpenAI on artificial intelligence.'
-                    }
-                ])
-            
-            if any(term in ['2024', 'trends', 'latest'] for term in search_terms):
-                fallback_results.extend([
-                    {
-                        'title': 'Tech Trends 2024 - Forbes',
-                        'url': 'https://www.forbes.com/technology/',
-                        'snippet': 'Latest technology trends and innovations for 2024.'
-                    }
-                ])
+            # Classify the query in one pass, then offer the canned results of each category
+            categories = {FALLBACK_TERMS[match.group(1).lower()] for match in FALLBACK_TERM_RE.finditer(query)}
+            fallback_results = [
+                result
+                for category, results in FALLBACK_RESULTS.items() if category in categories
+                for result in results
+            ]
             
             return fallback_results[:5]
             
@@ -829,6 +1281,7 @@ class StreamlitBrowserSearchBot:
 
     def fallback_search_and_summarize(self, query, max_results=5):
         """Complete fallback search and summarize method"""
+        self.cacheable = False
         try:
             self.log_activity("FALLBACK", "Using complete fallback method...")
             
@@ -839,24 +1292,11 @@ class StreamlitBrowserSearchBot:
                 # Create a basic AI-generated response without web scraping
                 return self.generate_ai_only_response(query)
             
-            # Scrape the fallback results
-            for i, result in enumerate(self.search_results[:max_results]):
-                try:
-                    self.log_activity("PROGRESS", f"Scraping fallback result {i+1}: {result['title'][:50]}...")
-                    content = self.scrape_webpage_content(result['url'])
-                    self.scraped_content.append({
-                        'title': result['title'],
-                        'url': result['url'],
-                        'snippet': result['snippet'],
-                        'content': content
-                    })
-                except Exception as e:
-                    self.log_activity("WARNING", f"Failed to scrape fallback result {i+1}: {str(e)}")
-                    continue
+            # Scrape and summarize the fallback results
+            scrape_jobs = self.start_scrapes(self.search_results, max_results, label="fallback result")
+            summary = self.summarize_scrapes(query, scrape_jobs, label="fallback result")
             
-            if self.scraped_content:
-                summary = self.generate_summary(query)
-            else:
+            if summary is None:
                 summary = self.generate_ai_only_response(query)['summary']
             
             self.current_status = "complete"
@@ -867,7 +1307,7 @@ class StreamlitBrowserSearchBot:
                 'search_results': self.search_results,
                 'scraped_content': self.scraped_content,
                 'summary': summary,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
             
         except Exception as e:
@@ -875,26 +1315,20 @@ class StreamlitBrowserSearchBot:
 
     def generate_ai_only_response(self, query):
         """Generate response using only AI knowledge when web scraping fails"""
+        self.cacheable = False
         try:
             self.log_activity("AI", "Generating AI-only response (no web scraping)...")
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant. The user asked a question but web search is currently unavailable. Provide a comprehensive answer based on your training data. Be clear that this information is based on your knowledge cutoff and may not include the very latest developments."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Please provide a comprehensive answer about: {query}"
-                    }
-                ],
-                max_tokens=1000,
-                temperature=0.3
-            )
-            
-            summary = response.choices[0].message.content
+            summary = st.write_stream(self.stream_chat([
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant. The user asked a question but web search is currently unavailable. Provide a comprehensive answer based on your training data. Be clear that this information is based on your knowledge cutoff and may not include the very latest developments."
+                },
+                {
+                    "role": "user",
+                    "content": f"Please provide a comprehensive answer about: {query}"
+                }
+            ]))
             
             # Add disclaimer
             summary = f"**Note: Web search is currently unavailable, so this response is based on AI knowledge only and may not include the very latest information.**\n\n{summary}"
@@ -907,7 +1341,7 @@ class StreamlitBrowserSearchBot:
                 'search_results': [],
                 'scraped_content': [],
                 'summary': summary,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
             
         except Exception as e:
@@ -917,19 +1351,33 @@ class StreamlitBrowserSearchBot:
             return {
                 'error': error_msg,
                 'query': query,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
 
     def search_and_summarize(self, query, max_results=5):
         """Main search method with multiple fallback strategies"""
+        cache = search_cache()
+        cached = cache.get((query, max_results))
+        if cached is not None:
+            self.current_status = "complete"
+            self.log_activity("COMPLETE", f"Using cached results for: {query}")
+            return cached
+
+        self.cacheable = True
         try:
-            # Try DuckDuckGo first (more bot-friendly than Google)
-            return self.search_with_duckduckgo(query, max_results)
+            # Try DuckDuckGo first (more bot-friendly than Google); its HTML
+            # endpoint needs no browser, the browser flow is the fallback
+            results = self.search_with_duckduckgo_http(query, max_results)
         except Exception as e:
             self.log_activity("ERROR", f"DuckDuckGo search failed: {str(e)}")
             # Fallback to AI-only response
             return self.generate_ai_only_response(query)
 
+        # Results are shared by every session, so only keep fully successful ones
+        if self.cacheable and 'error' not in results:
+            cache.put((query, max_results), results)
+        return results
+
 # Initialize session state
 if 'bot' not in st.session_state:
     st.session_state.bot = StreamlitBrowserSearchBot()
@@ -937,8 +1385,12 @@ if 'search_results' not in st.session_state:
     st.session_state.search_results = None
 if 'openai_configured' not in st.session_state:
     st.session_state.openai_configured = False
-if 'activity_logs' not in st.session_state:
-    st.session_state.activity_logs = []
+if 'log_lines' not in st.session_state:
+    st.session_state.log_lines = collections.deque(maxlen=LOG_DISPLAY_ENTRIES)
+if 'last_screenshot' not in st.session_state:
+    st.session_state.last_screenshot = None
+if 'exports' not in st.session_state:
+    st.session_state.exports = None
 
 def main():
     st.markdown("""
@@ -958,7 +1410,7 @@ def main():
             help="Your OpenAI API key is required for AI-powered summarization"
         )
         
-        if api_key and not st.session_state.openai_configured:
+        if api_key and (not st.session_state.openai_configured or st.session_state.bot.client is None):
             with st.spinner("Configuring OpenAI..."):
                 success, message = st.session_state.bot.initialize_openai(api_key)
                 if success:
@@ -1021,8 +1473,9 @@ def main():
         with col_clear:
             if st.button("🗑️ Clear Results"):
                 st.session_state.search_results = None
-                st.session_state.bot = StreamlitBrowserSearchBot()
-                st.session_state.activity_logs = []
+                st.session_state.bot.reset_query_state()
+                st.session_state.log_lines.clear()
+                st.session_state.last_screenshot = None
                 st.rerun()
 
         # Status indicator
@@ -1039,16 +1492,12 @@ def main():
         
         # Display screenshot if available
         try:
-            if not st.session_state.bot.screenshot_queue.empty():
-                latest_screenshot = None
-                # Get the latest screenshot
-                while not st.session_state.bot.screenshot_queue.empty():
-                    latest_screenshot = st.session_state.bot.screenshot_queue.get()
-                
-                if latest_screenshot:
-                    image_data = base64.b64decode(latest_screenshot)
-                    image = Image.open(BytesIO(image_data))
-                    screenshot_placeholder.image(image, caption="Live Browser View", use_column_width=True)
+            latest_screenshot = st.session_state.bot.screenshot_slot.get()
+            if latest_screenshot:
+                # Frames are ready-to-show JPEG bytes; keep the last one across reruns
+                st.session_state.last_screenshot = latest_screenshot
+            if st.session_state.last_screenshot is not None:
+                screenshot_placeholder.image(st.session_state.last_screenshot, caption="Live Browser View", use_column_width=True)
             else:
                 screenshot_placeholder.info("No browser activity yet")
         except Exception as e:
@@ -1061,7 +1510,7 @@ def main():
         else:
             # Reset previous results
             st.session_state.search_results = None
-            st.session_state.activity_logs = []
+            st.session_state.log_lines.clear()
             
             with st.spinner("🤖 AI is searching and analyzing..."):
                 if search_engine == "AI-Only (No web search)":
@@ -1076,29 +1525,19 @@ def main():
     # Activity Log Section
     st.header("📋 Real-time Activity Log")
     
-    # Collect activity logs
-    new_activity_logs = []
-    try:
-        while not st.session_state.bot.activity_queue.empty():
-            new_activity_logs.append(st.session_state.bot.activity_queue.get_nowait())
-    except queue.Empty:
-        pass
+    log_placeholder = st.empty()
     
-    # Add new logs to session state
-    st.session_state.activity_logs.extend(new_activity_logs)
+    # Format new log entries once; the deque keeps only the most recent ones
+    st.session_state.log_lines.extend(
+        f"[{log.timestamp}] {log.action_type}: {log.description}" + (f"\n    └─ {log.details}" if log.details else "")
+        for log in st.session_state.bot.drain_logs()
+    )
     
     # Display activity logs
-    if st.session_state.activity_logs:
-        activity_text = ""
-        # Show last 25 logs
-        for log in st.session_state.activity_logs[-25:]:
-            activity_text += f"[{log.timestamp}] {log.action_type}: {log.description}\n"
-            if log.details:
-                activity_text += f"    └─ {log.details}\n"
-        
-        st.code(activity_text, language="log")
+    if st.session_state.log_lines:
+        log_placeholder.code("\n".join(st.session_state.log_lines), language="log")
     else:
-        st.info("No activity logged yet. Start a search to see real-time updates!")
+        log_placeholder.info("No activity logged yet. Start a search to see real-time updates!")
 
     # Results Display Section
     if st.session_state.search_results:
@@ -1138,33 +1577,26 @@ def main():
             # Export Results
             st.subheader("💾 Export Results")
             col_export1, col_export2 = st.columns(2)
+            stamp = file_stamp(results['timestamp'])
+            
+            # Serialize once per result set, kept per session so downloads never mix users
+            if st.session_state.exports is None or st.session_state.exports[0] is not results:
+                st.session_state.exports = (results, results_json(results), results_report(results))
+            _, json_data, report = st.session_state.exports
             
             with col_export1:
-                json_data = json.dumps(results, indent=2, ensure_ascii=False)
                 st.download_button(
                     label="📁 Download Results as JSON",
                     data=json_data,
-                    file_name=f"search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    file_name=f"search_results_{stamp}.json",
                     mime="application/json"
                 )
             
             with col_export2:
-                # Create a simple text report
-                report = f"Search Results Report\n"
-                report += f"Query: {results['query']}\n"
-                report += f"Timestamp: {results['timestamp']}\n"
-                report += f"Results Found: {len(results.get('search_results', []))}\n\n"
-                report += f"Summary:\n{results.get('summary', 'No summary available')}\n\n"
-                
-                for i, result in enumerate(results.get('scraped_content', []), 1):
-                    report += f"{i}. {result['title']}\n"
-                    report += f"URL: {result['url']}\n"
-                    report += f"Content: {result['content'][:500]}...\n\n"
-                
                 st.download_button(
                     label="📄 Download as Text Report",
                     data=report,
-                    file_name=f"search_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                    file_name=f"search_report_{stamp}.txt",
                     mime="text/plain"
                 )
 